@@ -1,5 +1,5 @@
 from sqlmodel import SQLModel, Field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from enum import Enum
 
@@ -25,14 +25,17 @@ class Task(SQLModel, table=True):
     )
     status: TaskStatus = Field(
         default=TaskStatus.PENDING,
+        index=True,
         description="Current status of the task"
     )
     priority: TaskPriority = Field(
         default=TaskPriority.MEDIUM,
+        index=True,
         description="Priority level of the task"
     )
     created_at: datetime = Field(
-        default_factory=datetime.now,
+        default_factory=lambda: datetime.now(timezone.utc),
+        index=True,
         description="When the task was created"
     )
     updated_at: Optional[datetime] = Field(
@@ -4,50 +4,65 @@ Pydantic schemas for request/response validation.
 These models handle data validation, serialization, and API documentation.
 """
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, Field, TypeAdapter, field_serializer, field_validator, ConfigDict
+from datetime import datetime, timezone
 from typing import Optional
 from app.models import TaskStatus, TaskPriority
 
-class TaskBase(BaseModel):
+class TaskFieldValidators:
     """
-    Base schema containing common task fields.
-    This follows the DRY principle - we define common fields once.
+    Shared field validators for task schemas.
+    Defined once so the create and update schemas run identical logic
+    instead of maintaining two near-identical copies.
     """
-    title: str = Field(..., min_length=1, max_length=200, description="Task title")
-    description: Optional[str] = Field(None, max_length=1000, description="Task description")
-    status: Optional[TaskStatus] = Field(TaskStatus.PENDING, description="Task status")
-    priority: Optional[TaskPriority] = Field(TaskPriority.MEDIUM, description="Task priority")
-    due_date: Optional[datetime] = Field(None, description="Task deadline")
-    assigned_to: Optional[str] = Field(None, max_length=100, description="Assignee name")
-    
-    # Custom validator for title
-    @field_validator('title')
+    # check_fields=False because this mixin declares no fields itself;
+    # the validators bind to the fields of whichever schema inherits it
+    @field_validator('title', check_fields=False)
     @classmethod
-    def validate_title(cls, v: str) -> str:
+    def validate_title(cls, v: Optional[str]) -> Optional[str]:
         """
-        Validate title:
+        Validate title if provided:
         - Remove leading/trailing whitespace
         - Ensure it's not empty after stripping
         """
-        if v:
+        if v is not None:
             v = v.strip()
-        if not v:
-            raise ValueError("Title cannot be empty or whitespace only")
+            if not v:
+                raise ValueError("Title cannot be empty or whitespace only")
         return v
     
-    # Custom validator for due_date
-    @field_validator('due_date')
+    @field_validator('due_date', check_fields=False)
     @classmethod
     def validate_due_date(cls, v: Optional[datetime]) -> Optional[datetime]:
         """
-        Validate due date:
-        - Must be in the future if provided
+        Validate due date if provided:
+        - Must be in the future
+        - Naive datetimes are interpreted as UTC; aware ones are
+          converted, since SQLite storage drops the offset without
+          converting and would otherwise shift the client's value
         """
-        if v and v < datetime.now():
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        else:
+            v = v.astimezone(timezone.utc)
+        if v < datetime.now(timezone.utc):
             raise ValueError("Due date must be in the future")
         return v
 
+class TaskBase(TaskFieldValidators, BaseModel):
+    """
+    Base schema containing common task fields.
+    This follows the DRY principle - we define common fields once.
+    """
+    title: str = Field(..., min_length=1, max_length=200, description="Task title")
+    description: Optional[str] = Field(None, max_length=1000, description="Task description")
+    status: Optional[TaskStatus] = Field(TaskStatus.PENDING, description="Task status")
+    priority: Optional[TaskPriority] = Field(TaskPriority.MEDIUM, description="Task priority")
+    due_date: Optional[datetime] = Field(None, description="Task deadline")
+    assigned_to: Optional[str] = Field(None, max_length=100, description="Assignee name")
+
 class TaskCreate(TaskBase):
     """
     Schema for creating a new task.
@@ -56,37 +71,19 @@ class TaskCreate(TaskBase):
     """
     pass
 
-class TaskUpdate(BaseModel):
+class TaskUpdate(TaskFieldValidators, BaseModel):
     """
     Schema for updating an existing task.
-    All fields are optional to allow partial updates.
+    All fields are optional to allow partial updates. The model is only
+    built once from the request JSON, so re-validating on assignment
+    would be wasted work and is left disabled.
     """
-    model_config = ConfigDict(validate_assignment=True)
-    
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=1000)
     status: Optional[TaskStatus] = None
     priority: Optional[TaskPriority] = None
     due_date: Optional[datetime] = None
     assigned_to: Optional[str] = Field(None, max_length=100)
-    
-    @field_validator('title')
-    @classmethod
-    def validate_title(cls, v: Optional[str]) -> Optional[str]:
-        """Validate title if provided"""
-        if v is not None:
-            v = v.strip()
-            if not v:
-                raise ValueError("Title cannot be empty or whitespace only")
-        return v
-    
-    @field_validator('due_date')
-    @classmethod
-    def validate_due_date(cls, v: Optional[datetime]) -> Optional[datetime]:
-        """Validate due date if provided"""
-        if v and v < datetime.now():
-            raise ValueError("Due date must be in the future")
-        return v
 
 class TaskResponse(BaseModel):
     """
@@ -104,6 +101,18 @@ class TaskResponse(BaseModel):
     updated_at: Optional[datetime]
     due_date: Optional[datetime]
     assigned_to: Optional[str]
+    
+    @field_serializer('created_at', 'updated_at', 'due_date')
+    def serialize_datetime(self, v: Optional[datetime]) -> Optional[datetime]:
+        """
+        Timestamps are stored as naive UTC (SQLite drops the offset), but
+        freshly created rows still carry tzinfo in memory. Attach UTC to
+        naive values so create and read responses serialize identically,
+        always with an explicit UTC offset.
+        """
+        if v is not None and v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        return v
 
 class TaskListResponse(BaseModel):
     """
@@ -113,4 +122,12 @@ class TaskListResponse(BaseModel):
     tasks: list[TaskResponse]
     total: int
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[int] = Field(
+        None, description="Pass as after_id to fetch the next page; None on the last page"
+    )
+
+# Module-level adapter compiles the validation/serialization core once at
+# import time, so hot endpoints can dump ORM rows without the per-request
+# model construction FastAPI's response_model path performs
+TASK_ADAPTER = TypeAdapter(TaskResponse)
\ No newline at end of file